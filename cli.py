@@ -7,13 +7,21 @@ description: Command-line interface for I Ching divination.
 
 # Import necessary modules.
 import argparse
-import re
+import sys
 from hexagram import generate_hexagram
 
 # Import custom display messages as global constants.
 # See `display.py` for WELCOME_MESSAGE and HELP_MESSAGE.
 from display import WELCOME_MESSAGE, HELP_MESSAGE
 
+# Translation table mapping the accepted yao position separators to spaces, so
+# that the positions of the `change` command can be split with `str.split`.
+_COMMA_TO_SPACE = str.maketrans(",;/|", "    ")
+
+# Longest yao position token converted to an integer, leaving room for
+# leading zeros such as `01`.
+_MAX_POSITION_DIGITS = 16
+
 
 class DivinationTable:
     """Interactive Divination Table for I Ching."""
@@ -29,6 +37,22 @@ class DivinationTable:
         self.no_color = no_color
         self.running = True
 
+        # Map each command name to its handler. Every handler takes the
+        # arguments following the command name, those without arguments
+        # simply ignore them.
+        self._dispatch = {
+            name: handler
+            for names, handler in (
+                (("q", "quit", "exit", "system"), lambda _: self._quit()),
+                (("g", "get"), lambda _: self.get_hexagram()),
+                (("c", "change"), self.change_hexagram),
+                (("h", "help"), lambda _: self.show_help()),
+                (("s", "show"), lambda _: self.show_current()),
+                (("clear", "reset"), lambda _: self.reset_table()),
+            )
+            for name in names
+        }
+
     def display_prompt(self):
         """Display prompt.
 
@@ -45,15 +69,25 @@ class DivinationTable:
         """
         print(WELCOME_MESSAGE)
 
+        # Use `input()` with the prompt only in an interactive terminal. When
+        # the input is piped, read lines from `sys.stdin` directly, which is
+        # much faster than `input()`.
+        interactive = sys.stdin.isatty()
+        readline = input if interactive else sys.stdin.readline
+
         while self.running:
-            self.display_prompt()
+            if interactive:
+                self.display_prompt()
             try:
-                command = input().strip()
+                line = readline()
+                # `sys.stdin.readline()` returns an empty string only at EOF.
+                if not line and not interactive:
+                    raise EOFError
             except (EOFError, KeyboardInterrupt):
                 print("\nExit the divination table.")
                 break
 
-            self.process_command(command)
+            self.process_command(line.strip())
 
     def process_command(self, command):
         """Process user command.
@@ -66,30 +100,21 @@ class DivinationTable:
         if not command:
             return
 
-        cmd = command.lower().split()[0] if " " in command else command.lower()
-
-        if cmd in ["q", "quit", "exit", "system"]:
-            self.running = False
-            print("Return to terminal...")
-
-        elif cmd in ["g", "get"]:
-            self.get_hexagram()
-
-        elif cmd in ["c", "change"]:
-            self.change_hexagram(command)
+        head, _, args = command.partition(" ")
+        cmd = head.lower()
 
-        elif cmd in ["h", "help"]:
-            self.show_help()
-
-        elif cmd in ["s", "show"]:
-            self.show_current()
-
-        elif cmd in ["clear", "reset"]:
-            self.reset_table()
-
-        else:
+        handler = self._dispatch.get(cmd)
+        if handler is None:
             print(f"Unknown command: {command}.")
             print("Type 'h' for help.")
+            return
+
+        handler(args)
+
+    def _quit(self):
+        """Stop the divination table and return to terminal."""
+        self.running = False
+        print("Return to terminal...")
 
     def get_hexagram(self):
         """Get a new original hexagram.
@@ -106,77 +131,77 @@ class DivinationTable:
 
         self.original_hexagram.display_interpretation()
 
-    def change_hexagram(self, command):
-        """Process changing hexagram command."""
+    def change_hexagram(self, nums_part):
+        """Process changing hexagram command.
+
+        Args:
+            nums_part (str): The Yao positions following the command name.
+        """
         if not self.original_hexagram:
             print("Please get an original hexagram first using 'g' command.")
             return
 
         # Analyze the position of the changing yao.
-        try:
-            # Extract the numeric part.
-            nums_part = (
-                command[command.index(" ") + 1 :] if " " in command else ""
-            )
-
-            if not nums_part:
-                print("Usage: c <Yao position> or change <Yao position>")
-                print("For example: c 1,3,5 or change 2 4 6")
-                return
+        if not nums_part:
+            print("Usage: c <Yao position> or change <Yao position>")
+            print("For example: c 1,3,5 or change 2 4 6")
+            return
 
-            # Extract all the numbers with regex.
-            numbers = re.findall(r"\d+", nums_part)
-            if not numbers:
-                print("No valid numbers found.")
-                return
+        # Split the numeric part by the separators. Every token must be a
+        # number, otherwise show the correct usage and return.
+        tokens = nums_part.translate(_COMMA_TO_SPACE).split()
+        if not tokens:
+            print("No valid numbers found.")
+            return
+        if not all(t.isdecimal() for t in tokens):
+            print(f"Invalid yao positions: {nums_part}")
+            print("Correct usage: c 1,3,5 or change 2 4 6")
+            return
 
-            # Convert to integers and remove duplicates
-            positions = list(set(int(num) for num in numbers))
-
-            # Chack if the yao positions given to be changed are between 1 and
-            # 6. If not, throw out an error message and return.
-            for pos in positions:
-                if pos < 1 or pos > 6:
-                    print(
-                        f"Error: The yao position must between 1-6, "
-                        f"given {pos}."
-                    )
-                    return
-
-            # Chack if the asigned changing yao positions are valid.
-            changing_positions = []
-            for pos in positions:
-                yao = self.original_hexagram.yaos[pos - 1]
-                if not yao.changing:
-                    print(
-                        f"Warning: The Yao {pos} "
-                        f"({'Yang' if yao.value else 'Yin'}) is not changing "
-                        f"(less {'Yang' if yao.value else 'Yin'})."
-                    )
-                else:
-                    changing_positions.append(pos)
-
-            # If there's no changeable Yao, just return.
-            if not changing_positions:
-                print("No changeable Yao. Remain the original hexagram.")
+        # Convert to integers and remove duplicates. Tokens longer than
+        # `_MAX_POSITION_DIGITS` are out of range anyway, and are not passed
+        # to `int()`, which refuses numbers with too many digits.
+        positions = set()
+        for t in tokens:
+            # Chack if the yao positions given to be changed are between 1
+            # and 6. If not, throw out an error message and return.
+            if len(t) > _MAX_POSITION_DIGITS or not 1 <= int(t) <= 6:
+                print(
+                    f"Error: The yao position must between 1-6, given {t}."
+                )
                 return
+            positions.add(int(t))
+
+        # Chack if the asigned changing yao positions are valid.
+        changing_positions = []
+        for pos in positions:
+            yao = self.original_hexagram.yaos[pos - 1]
+            if not yao.changing:
+                print(
+                    f"Warning: The Yao {pos} "
+                    f"({'Yang' if yao.value else 'Yin'}) is not changing "
+                    f"(less {'Yang' if yao.value else 'Yin'})."
+                )
+            else:
+                changing_positions.append(pos)
+
+        # If there's no changeable Yao, just return.
+        if not changing_positions:
+            print("No changeable Yao. Remain the original hexagram.")
+            return
 
-            print(f"Changing positions: {changing_positions}")
+        print(f"Changing positions: {changing_positions}")
 
-            # Generate changing hexagram.
-            self.changed_hexagram = (
-                self.original_hexagram.get_changing_hexagram(changing_positions)
-            )
+        # Generate changing hexagram.
+        self.changed_hexagram = (
+            self.original_hexagram.get_changing_hexagram(changing_positions)
+        )
 
-            print("\nChanging Hexagram:")
-            self.changed_hexagram.display(colored=not self.no_color)
-
-            print("\nChanging Hexagram Interpretation:")
-            self.changed_hexagram.display_interpretation()
+        print("\nChanging Hexagram:")
+        self.changed_hexagram.display(colored=not self.no_color)
 
-        except Exception as e:
-            print(f"Parsing error: {e}")
-            print("Correct usage: c 1,3,5 or change 2 4 6")
+        print("\nChanging Hexagram Interpretation:")
+        self.changed_hexagram.display_interpretation()
 
     def show_help(self):
         """Display help information"""
@@ -59,6 +59,30 @@ class Color:
     BOLD = "\033[1m"
 
 
+def _build_yao_strs() -> dict:
+    """Build the colored Yao strings for every coin sum and changing flag."""
+    yao_strs = {}
+    for changing in (False, True):
+        # Three 0 -> old Yin.
+        yao_strs[(0, changing)] = (
+            f"{Color.BLUE}### ###{Color.END}{' x' if changing else ''}"
+        )
+        # Two 0, One 1 -> young Yang.
+        yao_strs[(1, changing)] = f"{Color.RED}#######{Color.END}"
+        # Two 1, One 0 -> young Yin.
+        yao_strs[(2, changing)] = f"{Color.RED}### ###{Color.END}"
+        # Three 1 -> old Yang.
+        yao_strs[(3, changing)] = (
+            f"{Color.BLUE}#######{Color.END}{' o' if changing else ''}"
+        )
+    return yao_strs
+
+
+# Colored Yao strings keyed by (sum of coins, changing). There are only 8 of
+# them, so they are built once at import.
+_YAO_STRS = _build_yao_strs()
+
+
 def colored_yao(coins: tuple, value: int, changing: bool) -> str:
     """Return colored Yao string based on the coin results.
 
@@ -71,24 +95,4 @@ def colored_yao(coins: tuple, value: int, changing: bool) -> str:
     Returns:
         str: The colored Yao string.
     """
-
-    sum_coins = sum(coins)
-
-    if sum_coins == 0:  # Three 0 -> old Yin.
-        symbol = "### ###"
-        color = Color.BLUE
-        marker = " x" if changing else ""
-    elif sum_coins == 1:  # Two 0, One 1 -> young Yang.
-        symbol = "#######"
-        color = Color.RED
-        marker = ""
-    elif sum_coins == 2:  # Two 1, One 0 -> young Yin.
-        symbol = "### ###"
-        color = Color.RED
-        marker = ""
-    elif sum_coins == 3:  # Three 1 -> old Yang.
-        symbol = "#######"
-        color = Color.BLUE
-        marker = " o" if changing else ""
-
-    return f"{color}{symbol}{Color.END}{marker}"
+    return _YAO_STRS[(sum(coins), bool(changing))]
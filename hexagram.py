@@ -6,13 +6,52 @@ description: Hexagram generation and manipulation for I Ching divination.
 """
 
 # Import necessary modules.
+import functools
+import os
 import random
+import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple
-
-
-@dataclass
+from typing import Dict, Iterable, List, Tuple
+from display import colored_yao
+
+# Each 6-bit mask spread to 18 bits, with bit i widened to the 3-bit coin group
+# of the Yao at position i + 1 (e.g. 0b101 -> 0o707).
+_SPREAD3 = tuple(
+    sum(0b111 << (3 * i) for i in range(6) if (m >> i) & 1) for m in range(64)
+)
+
+# Bound once, so that drawing the coins skips the `random` attribute lookup.
+_getrandbits = random.getrandbits
+
+# 6-bit binary strings of all 64 hexagram numbers, from Top Yao to First Yao.
+_BIN06 = tuple(format(i, "06b") for i in range(64))
+
+# Directory holding the hexagram interpretation files.
+_DATA_DIR = Path(__file__).parent / "data" / "hexagrams"
+
+# Available interpretation files keyed by hexagram number, listed once at
+# import so that no existence check is needed when reading them.
+_INTERP_PATHS: Dict[int, Path] = (
+    {
+        int(entry.name[:-4]): Path(entry.path)
+        for entry in os.scandir(_DATA_DIR)
+        if entry.name.endswith(".txt") and entry.name[:-4].isdecimal()
+    }
+    if _DATA_DIR.is_dir()
+    else {}
+)
+
+# Yao determined by the number of 1s among the three coins, as
+# (value, changing):
+#   0 -> Three 0s -> Old Yin (changeable)
+#   1 -> Two 0s and one 1 -> Young Yang (unchangeable)
+#   2 -> Two 1s and one 0 -> Young Yin (unchangeable)
+#   3 -> Three 1s -> Old Yang (changeable)
+_YAO_TABLE = ((0, True), (1, False), (0, False), (1, True))
+
+
+@dataclass(slots=True)
 class Yao:
     value: bool  # 0: Yin, 1: Yang.
     changing: bool  # Whether to be changeable (for old Yin/Yang).
@@ -20,8 +59,6 @@ class Yao:
 
     def display(self, colored=True) -> str:
         """Display the Yao hexagram."""
-        from display import colored_yao
-
         if colored:
             return colored_yao(self.coins, self.value, self.changing)
         else:
@@ -33,105 +70,143 @@ class Yao:
 
 
 class Hexagram:
-    def __init__(self, yaos: List[Yao]):
-        self.yaos = yaos  # List of six Yao objects, from First Yao to Top Yao.
-        self._calculate_hexagram()
-
-    def _calculate_hexagram(self):
-        """Calculate the hexagram number and binary representation."""
-        # Calculate number: First Yao is the least significant bit, Top Yao is
-        # the most significant bit
-        self.original_number = 0
-        # i from 0 to 5, corresponding to First Yao to Top Yao.
-        for i, yao in enumerate(self.yaos):
-            if yao.value == 1:
-                self.original_number += 1 << i  # 2 to the power of i
-        # Generate binary string from Top Yao to First Yao (6 bits, padded with
-        # 0 if needed)
-        self.original_binary = format(self.original_number, "06b")
+    def __init__(self, values: int, changing_mask: int, coins_bits: int):
+        """Initialize the hexagram from packed bits.
+
+        Bit i of each mask (3-bit group i of `coins_bits`) belongs to the Yao
+        at position i + 1, i.e. First Yao is the least significant.
+
+        Args:
+            values (int): 6-bit mask of the Yao values (0: Yin, 1: Yang).
+            changing_mask (int): 6-bit mask of the changeable Yaos.
+            coins_bits (int): 18-bit packed results of the three coins of
+                each Yao.
+        """
+        self.values = values
+        self.changing_mask = changing_mask
+        self.coins_bits = coins_bits
+        self._yaos = None
+        # The values mask is the hexagram number itself: First Yao is the
+        # least significant bit, Top Yao is the most significant bit.
+        self.original_number = values
+
+    @property
+    def yaos(self) -> List[Yao]:
+        """List of six Yao objects, from First Yao to Top Yao.
+
+        The Yao objects are only built on first access.
+        """
+        if self._yaos is None:
+            self._yaos = []
+            for i in range(6):
+                g = (self.coins_bits >> (3 * i)) & 7
+                self._yaos.append(
+                    Yao(
+                        (self.values >> i) & 1,
+                        bool((self.changing_mask >> i) & 1),
+                        ((g >> 2) & 1, (g >> 1) & 1, g & 1),
+                    )
+                )
+        return self._yaos
+
+    @property
+    def original_binary(self) -> str:
+        """Binary string from Top Yao to First Yao (6 bits, padded with 0)."""
+        return _BIN06[self.original_number]
 
     def display(self, colored=True):
         """Display the hexagram (from top to bottom)"""
-        for i in range(5, -1, -1):  # From Top Yao (6) to First Yao (1)
-            yao = self.yaos[i]
-            print(yao.display(colored))
+        # Build the whole hexagram first and write it out at once, from Top
+        # Yao (6) to First Yao (1).
+        yaos = self.yaos
+        sys.stdout.write(
+            "\n".join(yaos[i].display(colored) for i in range(5, -1, -1))
+            + "\n"
+        )
 
-    def get_changing_hexagram(self, positions: List[int]) -> "Hexagram":
+    def get_changing_hexagram(self, positions: Iterable[int]) -> "Hexagram":
         """Generate a changing hexagram based on specified Yao positions.
 
         Args:
-            positions: List of Yao positions to change (1-6)
+            positions: Yao positions to change (1-6)
 
         Returns:
             A new Hexagram object (changing hexagram).
         """
-        new_yaos = []
-        for idx, yao in enumerate(self.yaos):
-            position = idx + 1  # Yao position (1-6).
-
-            # Judge if the user's input is within 1~6.
-            if position in positions and yao.changing:
-                # Changing Yao: Old Yin changes to Young Yang, Old Yang changes
-                # to Young Yin. Then exchange Yin and Yang.
-                new_value = 1 if yao.value == 0 else 0
-                # Generate new coin results (consistent with the changed
-                # Yin/Yang)
-                if new_value == 0:  # Change to Young Yin
-                    new_coins = (0, 1, 1)  # Two 1s and one 0
-                else:  # Change to Young Yang
-                    new_coins = (1, 0, 0)  # Two 0s and one 1
-                new_changing = False
-                # After change, it becomes Young Yin/Young Yang, no longer
-                # changeable.
-            else:
-                # Unchanged Yao
-                new_value = yao.value
-                new_coins = yao.coins
-                new_changing = yao.changing
-
-            new_yaos.append(Yao(new_value, new_changing, new_coins))
-
-        return Hexagram(new_yaos)
-
-    def _get_data_path(self, filename: str) -> Path:
-        """Get the data file path."""
-        return Path(__file__).parent / "data" / "hexagrams" / filename
+        # Only the changeable Yaos at the given positions are changed.
+        mask = self._positions_to_mask(positions) & self.changing_mask
+        # Changing Yao: Old Yin changes to Young Yang, Old Yang changes to
+        # Young Yin. After change, it is no longer changeable.
+        new_values = self.values ^ mask
+        new_changing = self.changing_mask & ~mask
+
+        # Generate new coin results (consistent with the changed Yin/Yang):
+        # 0b011 (two 1s and one 0) for Young Yin, 0b100 (two 0s and one 1)
+        # for Young Yang.
+        new_coins_bits = (
+            (self.coins_bits & ~_SPREAD3[mask])
+            | (_SPREAD3[mask & new_values] & 0o444444)
+            | (_SPREAD3[mask & ~new_values] & 0o333333)
+        )
+
+        return Hexagram(new_values, new_changing, new_coins_bits)
+
+    @staticmethod
+    def _positions_to_mask(positions: Iterable[int]) -> int:
+        """Convert Yao positions (1-6) to a 6-bit mask, ignoring others."""
+        m = 0
+        for p in positions:
+            if 1 <= p <= 6:
+                m |= 1 << (p - 1)
+        return m
 
     def get_interpretation(self, hexagram_number: int) -> str:
         """Read the hexagram interpretation file."""
-        filepath = self._get_data_path(f"{hexagram_number:02d}.txt")
-        if filepath.exists():
-            try:
-                return filepath.read_text(encoding="utf-8")
-            except:
-                return filepath.read_text(encoding="gbk")
-        return (  # The string is warped here for better readability (80 cols).
-            f"Hexagram interpretation file {hexagram_number:02d}.txt not "
-            "found."
-        )
+        return _load_interp(hexagram_number)
 
     def display_interpretation(self):
         """Display the hexagram interpretation."""
-        print(self.get_interpretation(self.original_number))
+        # Write the text and its trailing newline in a single call.
+        sys.stdout.write(self.get_interpretation(self.original_number) + "\n")
+
+
+@functools.lru_cache(maxsize=64)
+def _load_interp(hexagram_number: int) -> str:
+    """Load the hexagram interpretation text.
+
+    The result is cached, so each interpretation file is read from disk only
+    once. There are 64 hexagrams, so the cache covers all of them.
+    """
+    filepath = _INTERP_PATHS.get(hexagram_number)
+    if filepath is not None:
+        # Read the file once, then fall back to GBK if it is not UTF-8.
+        data = filepath.read_bytes()
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            text = data.decode("gbk", errors="replace")
+        # Normalize the CRLF line endings of the data files, as text mode
+        # reading did.
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return (  # The string is warped here for better readability (80 cols).
+        f"Hexagram interpretation file {hexagram_number:02d}.txt not "
+        "found."
+    )
 
 
 def generate_hexagram() -> Hexagram:
-    """Generate a six-yao hexagram."""
-    yaos = []
-    for _ in range(6):
-        coins = tuple(random.randint(0, 1) for _ in range(3))
-        sum_coins = sum(coins)
-
-        # Determine Yao based on rules
-        if sum_coins == 0:  # Three 0s -> Old Yin (changeable)
-            yao = Yao(0, True, coins)
-        elif sum_coins == 1:  # Two 0s and one 1 -> Young Yang (unchangeable)
-            yao = Yao(1, False, coins)
-        elif sum_coins == 2:  # Two 1s and one 0 -> Young Yin (unchangeable)
-            yao = Yao(0, False, coins)
-        else:  # Three 1s -> Old Yang (changeable)
-            yao = Yao(1, True, coins)
-
-        yaos.append(yao)
-
-    return Hexagram(yaos)
+    """Generate a six-yao hexagram.
+
+    The 18 coin results (three coins for each of the six yaos) are drawn at
+    once with a single `random.getrandbits(18)` call. Each 3-bit group holds
+    the coins of one yao, from First Yao (lowest bits) to Top Yao.
+    """
+    bits = _getrandbits(18)
+    values = changing_mask = 0
+    for i in range(6):
+        # The number of 1s decides the Yao, see `_YAO_TABLE`.
+        value, changing = _YAO_TABLE[((bits >> (3 * i)) & 7).bit_count()]
+        values |= value << i
+        changing_mask |= changing << i
+
+    return Hexagram(values, changing_mask, bits)